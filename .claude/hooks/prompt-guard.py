@@ -5,16 +5,22 @@ Injects best practice reminders on every prompt submission.
 Loads rules from .chainlink/rules/ markdown files.
 """
 
+import functools
 import json
 import sys
 import os
-import io
-import subprocess
-import hashlib
-from datetime import datetime
+import re
+import time
+
+# JSON input (package.json, hook config, caches) goes through orjson when it is installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 # Fix Windows encoding issues with Unicode characters
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+sys.stdout.reconfigure(encoding='utf-8')
 
 
 def _project_root_from_script():
@@ -25,11 +31,13 @@ def _project_root_from_script():
         return None
 
 
+@functools.lru_cache(maxsize=None)
 def _get_project_root():
     """Get the project root directory.
 
     Prefers deriving from the hook script's own path (works even when cwd is a
-    subdirectory), falling back to cwd.
+    subdirectory), falling back to cwd. Neither changes while the hook runs,
+    so the answer is worked out once and shared by every caller.
     """
     root = _project_root_from_script()
     if root and os.path.isdir(root):
@@ -73,52 +81,73 @@ def load_rule_file(rules_dir, filename):
         return ""
 
 
+# Language rule files in .chainlink/rules/ and the language each applies to
+LANGUAGE_FILES = {
+    'rust.md': 'Rust',
+    'python.md': 'Python',
+    'javascript.md': 'JavaScript',
+    'typescript.md': 'TypeScript',
+    'typescript-react.md': 'TypeScript/React',
+    'javascript-react.md': 'JavaScript/React',
+    'go.md': 'Go',
+    'java.md': 'Java',
+    'c.md': 'C',
+    'cpp.md': 'C++',
+    'csharp.md': 'C#',
+    'ruby.md': 'Ruby',
+    'php.md': 'PHP',
+    'swift.md': 'Swift',
+    'kotlin.md': 'Kotlin',
+    'scala.md': 'Scala',
+    'zig.md': 'Zig',
+    'odin.md': 'Odin',
+}
+
+
 def load_all_rules(chainlink_dir):
     """Load all rule files from .chainlink/rules/."""
     if not chainlink_dir:
         return {}, "", ""
 
     rules_dir = os.path.join(chainlink_dir, 'rules')
-    if not os.path.isdir(rules_dir):
+    # One directory listing instead of probing every known rule file
+    try:
+        with os.scandir(rules_dir) as it:
+            present = {entry.name for entry in it if entry.is_file()}
+    except OSError:
         return {}, "", ""
 
     # Load global rules
-    global_rules = load_rule_file(rules_dir, 'global.md')
+    global_rules = load_rule_file(rules_dir, 'global.md') if 'global.md' in present else ""
 
     # Load project rules
-    project_rules = load_rule_file(rules_dir, 'project.md')
+    project_rules = load_rule_file(rules_dir, 'project.md') if 'project.md' in present else ""
 
     # Load language-specific rules
     language_rules = {}
-    language_files = [
-        ('rust.md', 'Rust'),
-        ('python.md', 'Python'),
-        ('javascript.md', 'JavaScript'),
-        ('typescript.md', 'TypeScript'),
-        ('typescript-react.md', 'TypeScript/React'),
-        ('javascript-react.md', 'JavaScript/React'),
-        ('go.md', 'Go'),
-        ('java.md', 'Java'),
-        ('c.md', 'C'),
-        ('cpp.md', 'C++'),
-        ('csharp.md', 'C#'),
-        ('ruby.md', 'Ruby'),
-        ('php.md', 'PHP'),
-        ('swift.md', 'Swift'),
-        ('kotlin.md', 'Kotlin'),
-        ('scala.md', 'Scala'),
-        ('zig.md', 'Zig'),
-        ('odin.md', 'Odin'),
-    ]
-
-    for filename, lang_name in language_files:
+    for filename in present & LANGUAGE_FILES.keys():
         content = load_rule_file(rules_dir, filename)
         if content:
-            language_rules[lang_name] = content
+            language_rules[LANGUAGE_FILES[filename]] = content
 
     return language_rules, global_rules, project_rules
 
 
+@functools.lru_cache(maxsize=None)
+def list_dir(path):
+    """Return the DirEntry objects of a directory, or () if it can't be read.
+
+    Memoized for the life of the hook so language detection and the project
+    tree share one read per directory instead of each listing and stat'ing
+    the same paths again.
+    """
+    try:
+        with os.scandir(path) as it:
+            return tuple(it)
+    except OSError:
+        return ()
+
+
 # Detect language from common file extensions in the working directory
 def detect_languages():
     """Scan for common source files to determine active languages."""
@@ -163,38 +192,26 @@ def detect_languages():
 
     # Check cwd and immediate subdirs for config files
     check_dirs = [cwd]
-    try:
-        for entry in os.listdir(cwd):
-            subdir = os.path.join(cwd, entry)
-            if os.path.isdir(subdir) and not entry.startswith('.'):
-                check_dirs.append(subdir)
-    except (PermissionError, OSError):
-        pass
-
-    for check_dir in check_dirs:
-        for config_file, lang in config_indicators.items():
-            if os.path.exists(os.path.join(check_dir, config_file)):
-                found.add(lang)
+    for entry in list_dir(cwd):
+        if not entry.name.startswith('.') and entry.is_dir():
+            check_dirs.append(entry.path)
 
-    # Also scan for source files in src/ directories
+    # Also scan for source files in src/ directories, including nested
+    # project src dirs (cwd itself is the first check dir)
     scan_dirs = [cwd]
-    src_dir = os.path.join(cwd, 'src')
-    if os.path.isdir(src_dir):
-        scan_dirs.append(src_dir)
-    # Check nested project src dirs too
     for check_dir in check_dirs:
-        nested_src = os.path.join(check_dir, 'src')
-        if os.path.isdir(nested_src):
-            scan_dirs.append(nested_src)
+        for entry in list_dir(check_dir):
+            name = entry.name
+            if name in config_indicators:
+                found.add(config_indicators[name])
+            elif name == 'src' and entry.is_dir():
+                scan_dirs.append(entry.path)
 
     for scan_dir in scan_dirs:
-        try:
-            for entry in os.listdir(scan_dir):
-                ext = os.path.splitext(entry)[1].lower()
-                if ext in extensions:
-                    found.add(extensions[ext])
-        except (PermissionError, OSError):
-            pass
+        for entry in list_dir(scan_dir):
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext in extensions:
+                found.add(extensions[ext])
 
     return list(found) if found else ['the project']
 
@@ -217,13 +234,26 @@ def get_language_section(languages, language_rules):
     return "\n\n".join(sections)
 
 
-# Directories to skip when building project tree
-SKIP_DIRS = {
+# Directories to skip when building project tree (*.egg-info is matched by suffix)
+SKIP_DIRS = frozenset({
     '.git', 'node_modules', 'target', 'venv', '.venv', 'env', '.env',
     '__pycache__', '.chainlink', '.claude', 'dist', 'build', '.next',
     '.nuxt', 'vendor', '.idea', '.vscode', 'coverage', '.pytest_cache',
-    '.mypy_cache', '.tox', 'eggs', '*.egg-info', '.sass-cache'
-}
+    '.mypy_cache', '.tox', 'eggs', '.sass-cache'
+})
+
+
+def should_skip(name):
+    """Return True for directories left out of the project tree.
+
+    Hidden directories are skipped except .github. The set lookup runs first
+    since it settles the common heavy directories in one hash probe.
+    """
+    return (
+        name in SKIP_DIRS
+        or (name[:1] == '.' and name != '.github')
+        or name.endswith('.egg-info')
+    )
 
 
 def get_project_tree(max_depth=3, max_entries=50):
@@ -231,41 +261,41 @@ def get_project_tree(max_depth=3, max_entries=50):
     cwd = _get_project_root()
     entries = []
 
-    def should_skip(name):
-        if name.startswith('.') and name not in ('.github', '.claude'):
-            return True
-        return name in SKIP_DIRS or name.endswith('.egg-info')
-
-    def walk_dir(path, prefix="", depth=0):
-        if depth > max_depth or len(entries) >= max_entries:
-            return
-
-        try:
-            items = sorted(os.listdir(path))
-        except (PermissionError, OSError):
-            return
-
-        # Separate dirs and files
-        dirs = [i for i in items if os.path.isdir(os.path.join(path, i)) and not should_skip(i)]
-        files = [i for i in items if os.path.isfile(os.path.join(path, i)) and not i.startswith('.')]
+    # Iterative depth-first walk. Subdirectories are pushed in reverse so
+    # they pop in sorted order, and each one's "name/" line is emitted when
+    # it is popped, immediately before its own contents.
+    stack = [("", cwd, "", 0)]
+    while stack and len(entries) < max_entries:
+        name, path, prefix, depth = stack.pop()
+        if name:
+            entries.append(f"{prefix}{name}/")
+            prefix += "  "
+        if depth > max_depth:
+            continue
+
+        items = sorted(list_dir(path), key=lambda e: e.name)
+
+        # Separate dirs and files using the entry types from the directory
+        # listing itself, so no extra stat per entry. Symlinked directories
+        # are not followed to keep the walk from looping.
+        dirs = [e for e in items if e.is_dir(follow_symlinks=False) and not should_skip(e.name)]
+        files = [e.name for e in items if e.is_file() and not e.name.startswith('.')]
 
         # Add files first (limit per directory)
+        full = False
         for f in files[:10]:  # Max 10 files per dir shown
             if len(entries) >= max_entries:
-                return
+                full = True
+                break
             entries.append(f"{prefix}{f}")
+        if full:
+            break
 
         if len(files) > 10:
             entries.append(f"{prefix}... ({len(files) - 10} more files)")
 
-        # Then recurse into directories
-        for d in dirs:
-            if len(entries) >= max_entries:
-                return
-            entries.append(f"{prefix}{d}/")
-            walk_dir(os.path.join(path, d), prefix + "  ", depth + 1)
-
-    walk_dir(cwd)
+        # Then descend into directories
+        stack.extend((d.name, d.path, prefix, depth + 1) for d in reversed(dirs))
 
     if not entries:
         return ""
@@ -276,31 +306,75 @@ def get_project_tree(max_depth=3, max_entries=50):
     return "\n".join(entries)
 
 
-
 def get_lock_file_hash(lock_path):
     """Get a hash of the lock file for cache invalidation."""
+    import hashlib  # deferred: only the full guard computes cache keys
     try:
         mtime = os.path.getmtime(lock_path)
-        return hashlib.md5(f"{lock_path}:{mtime}".encode()).hexdigest()[:12]
+        return hashlib.blake2b(f"{lock_path}:{mtime}".encode(), digest_size=6).hexdigest()
     except OSError:
         return None
 
 
-def run_command(cmd, timeout=5):
-    """Run a command and return output, or None on failure."""
+# Version of an inline table dependency: name = { version = "x.y", ... }
+CARGO_VERSION_RE = re.compile(r'version\s*=\s*"([^"]+)"')
+
+# Manifests read by get_dependencies; their mtimes key the dependency cache
+DEPENDENCY_FILES = ('Cargo.toml', 'package.json', 'requirements.txt', 'go.mod')
+
+
+def get_dependencies_cache_key(cwd):
+    """Cache key for the dependency list, from the manifest files' mtimes."""
+    return ":".join(str(get_lock_file_hash(os.path.join(cwd, name))) for name in DEPENDENCY_FILES)
+
+
+def get_project_cache_path(chainlink_dir):
+    """Get the path to the cached dependency list."""
+    if not chainlink_dir:
+        return None
+    return os.path.join(chainlink_dir, '.cache', 'project-context.json')
+
+
+def load_project_cache(chainlink_dir):
+    """Load the project context cache, or an empty dict if missing or unreadable."""
+    path = get_project_cache_path(chainlink_dir)
+    if not path:
+        return {}
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            shell=True
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except (subprocess.TimeoutExpired, OSError, Exception):
-        pass
-    return None
+        with open(path, 'rb') as f:
+            cache = _loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_project_cache(chainlink_dir, cache):
+    """Write the project context cache atomically so concurrent hooks never see a partial file."""
+    path = get_project_cache_path(chainlink_dir)
+    if not path:
+        return
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def cached_section(cache, name, key, compute):
+    """Return the cached value for name if its key still matches, else recompute and store it."""
+    entry = cache.get(name)
+    if key is not None and isinstance(entry, dict) and entry.get('key') == key:
+        return entry.get('value', '')
+    value = compute()
+    if key is not None:
+        cache[name] = {'key': key, 'value': value}
+    return value
 
 
 def get_dependencies(max_deps=30):
@@ -314,9 +388,9 @@ def get_dependencies(max_deps=30):
         # Parse Cargo.toml for direct dependencies (faster than cargo tree)
         try:
             with open(cargo_toml, 'r') as f:
-                content = f.read()
+                # Stream lines so parsing stops as soon as [dependencies] ends
                 in_deps = False
-                for line in content.split('\n'):
+                for line in f:
                     if line.strip().startswith('[dependencies]'):
                         in_deps = True
                         continue
@@ -328,8 +402,7 @@ def get_dependencies(max_deps=30):
                         rest = parts[1].strip() if len(parts) > 1 else ''
                         if rest.startswith('{'):
                             # Handle { version = "x.y", features = [...] } format
-                            import re
-                            match = re.search(r'version\s*=\s*"([^"]+)"', rest)
+                            match = CARGO_VERSION_RE.search(rest)
                             if match:
                                 deps.append(f"  {name} = \"{match.group(1)}\"")
                         elif rest.startswith('"') or rest.startswith("'"):
@@ -346,15 +419,16 @@ def get_dependencies(max_deps=30):
     package_json = os.path.join(cwd, 'package.json')
     if os.path.exists(package_json):
         try:
-            with open(package_json, 'r') as f:
-                pkg = json.load(f)
+            with open(package_json, 'rb') as f:
+                pkg = _loads(f.read())
                 for dep_type in ['dependencies', 'devDependencies']:
-                    if dep_type in pkg:
-                        for name, version in list(pkg[dep_type].items())[:max_deps]:
+                    section = pkg.get(dep_type) if isinstance(pkg, dict) else None
+                    if isinstance(section, dict):
+                        for name, version in list(section.items())[:max_deps]:
                             deps.append(f"  {name}: {version}")
                             if len(deps) >= max_deps:
                                 break
-        except (OSError, json.JSONDecodeError, Exception):
+        except (OSError, ValueError):
             pass
         if deps:
             return "Node.js (package.json):\n" + "\n".join(deps[:max_deps])
@@ -402,6 +476,9 @@ def get_dependencies(max_deps=30):
 
 def build_reminder(languages, project_tree, dependencies, language_rules, global_rules, project_rules, tracking_mode="strict", chainlink_dir=None):
     """Build the full reminder context."""
+    # Only the full guard needs datetime; keep it off the condensed path
+    from datetime import datetime
+
     lang_section = get_language_section(languages, language_rules)
     lang_list = ", ".join(languages) if languages else "this project"
     current_year = datetime.now().year
@@ -503,14 +580,19 @@ Use `chainlink session work <id>` to mark what you're working on.
     if project_rules:
         project_section = f"\n### Project-Specific Rules\n{project_rules}\n"
 
-    reminder = f"""<chainlink-behavioral-guard>
-## Code Quality Requirements
-
-You are working on a {lang_list} project. Follow these requirements strictly:
-{tree_section}{deps_section}{global_section}{tracking_section}{lang_section}{project_section}
-</chainlink-behavioral-guard>"""
-
-    return reminder
+    # Assemble with one join rather than re-copying every section into a template
+    parts = [
+        "<chainlink-behavioral-guard>\n## Code Quality Requirements\n\n",
+        f"You are working on a {lang_list} project. Follow these requirements strictly:\n",
+        tree_section,
+        deps_section,
+        global_section,
+        tracking_section,
+        lang_section,
+        project_section,
+        "\n</chainlink-behavioral-guard>",
+    ]
+    return "".join(parts)
 
 
 def get_guard_marker_path(chainlink_dir):
@@ -526,28 +608,57 @@ def should_send_full_guard(chainlink_dir):
     marker = get_guard_marker_path(chainlink_dir)
     if not marker:
         return True
-    if not os.path.exists(marker):
-        return True
-    # Re-send full guard if marker is older than 4 hours (new session likely)
+    # One stat answers both "does the marker exist" and "how old is it"
     try:
-        age = datetime.now().timestamp() - os.path.getmtime(marker)
-        if age > 4 * 3600:
-            return True
+        st = os.stat(marker)
     except OSError:
         return True
-    return False
+    # Re-send full guard if marker is older than 4 hours (new session likely)
+    age = time.time() - st.st_mtime
+    return age > 4 * 3600
+
+
+def get_languages_cache_path(chainlink_dir):
+    """Get the path to the languages detected when the full guard was sent."""
+    if not chainlink_dir:
+        return None
+    return os.path.join(chainlink_dir, '.cache', 'detected-languages.json')
+
+
+def load_cached_languages(chainlink_dir):
+    """Return the languages saved alongside the guard marker, or None if unavailable.
+
+    The marker's 4 hour expiry also bounds this file: once it lapses the full
+    guard runs again and re-detects.
+    """
+    path = get_languages_cache_path(chainlink_dir)
+    if not path:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            languages = _loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if isinstance(languages, list) and languages and all(isinstance(lang, str) for lang in languages):
+        return languages
+    return None
+
 
+def mark_full_guard_sent(chainlink_dir, languages):
+    """Create marker file indicating full guard has been sent this session.
 
-def mark_full_guard_sent(chainlink_dir):
-    """Create marker file indicating full guard has been sent this session."""
+    Also saves the detected languages so condensed reminders can skip the scan.
+    """
     marker = get_guard_marker_path(chainlink_dir)
     if not marker:
         return
     try:
         cache_dir = os.path.dirname(marker)
         os.makedirs(cache_dir, exist_ok=True)
+        with open(get_languages_cache_path(chainlink_dir), 'w', encoding='utf-8') as f:
+            json.dump(languages, f)
         with open(marker, 'w') as f:
-            f.write(str(datetime.now().timestamp()))
+            f.write(str(time.time()))
     except OSError:
         pass
 
@@ -560,12 +671,12 @@ def load_tracking_mode(chainlink_dir):
     if not os.path.isfile(config_path):
         return "strict"
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        with open(config_path, "rb") as f:
+            config = _loads(f.read())
         mode = config.get("tracking_mode", "strict")
         if mode in ("strict", "normal", "relaxed"):
             return mode
-    except (json.JSONDecodeError, OSError):
+    except (ValueError, OSError):
         pass
     return "strict"
 
@@ -619,13 +730,11 @@ Full rules were injected on first prompt. Use `chainlink list -s open` to see cu
 
 
 def main():
+    # The reminder doesn't depend on the prompt; drain it unparsed so the
+    # caller's write never hits a closed pipe.
     try:
-        # Read input from stdin (Claude Code passes prompt info)
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
-        # If no valid JSON, still inject reminder
-        pass
-    except Exception:
+        sys.stdin.buffer.read()
+    except (OSError, ValueError, AttributeError):
         pass
 
     # Find chainlink directory and load rules
@@ -634,7 +743,7 @@ def main():
 
     # Check if we should send full or condensed guard
     if not should_send_full_guard(chainlink_dir):
-        languages = detect_languages()
+        languages = load_cached_languages(chainlink_dir) or detect_languages()
         print(build_condensed_reminder(languages, tracking_mode))
         sys.exit(0)
 
@@ -643,17 +752,28 @@ def main():
     # Detect languages in the project
     languages = detect_languages()
 
-    # Generate project tree to prevent path hallucinations
+    # Generate project tree to prevent path hallucinations. It is rebuilt
+    # every time: a key covering every directory it shows would take the
+    # same walk.
     project_tree = get_project_tree()
 
+    # The dependency list rarely changes between sessions, so reuse the
+    # cached copy until one of the manifests is touched
+    cwd = _get_project_root()
+    cache = load_project_cache(chainlink_dir)
+    snapshot = dict(cache)
+
     # Get installed dependencies to prevent version hallucinations
-    dependencies = get_dependencies()
+    dependencies = cached_section(cache, 'dependencies', get_dependencies_cache_key(cwd), get_dependencies)
+
+    if cache != snapshot:
+        save_project_cache(chainlink_dir, cache)
 
     # Output the full reminder
     print(build_reminder(languages, project_tree, dependencies, language_rules, global_rules, project_rules, tracking_mode, chainlink_dir))
 
     # Mark that we've sent the full guard this session
-    mark_full_guard_sent(chainlink_dir)
+    mark_full_guard_sent(chainlink_dir, languages)
     sys.exit(0)
 
 
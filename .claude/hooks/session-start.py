@@ -14,6 +14,11 @@ from datetime import datetime, timezone
 # Sessions older than this (in hours) are considered stale and auto-ended
 STALE_SESSION_HOURS = 4
 
+# Fields parsed out of `chainlink session status` output
+SESSION_DURATION_RE = re.compile(r'Duration:\s*(\d+)\s*minutes')
+LAST_ACTION_RE = re.compile(r'Last action:\s*(.+)')
+WORKING_ON_RE = re.compile(r'Working on: #(\d+)')
+
 
 def run_chainlink(args):
     """Run a chainlink command and return output."""
@@ -29,8 +34,35 @@ def run_chainlink(args):
         return None
 
 
-def check_chainlink_initialized():
-    """Check if .chainlink directory exists.
+def run_chainlink_concurrently(commands):
+    """Run independent chainlink commands at the same time, returning outputs in order."""
+    if len(commands) < 2:
+        return [run_chainlink(args) for args in commands]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+            return list(executor.map(run_chainlink, commands))
+    except RuntimeError:
+        return [run_chainlink(args) for args in commands]
+
+
+def get_session_context():
+    """Return (last handoff, session status, ready issues, open issues) output.
+
+    The four queries only read, so they run concurrently.
+    """
+    return tuple(run_chainlink_concurrently([
+        ["session", "last-handoff"],
+        ["session", "status"],
+        ["ready"],
+        ["list", "-s", "open"],
+    ]))
+
+
+def find_chainlink_dir():
+    """Find the .chainlink directory.
 
     Prefers the project root derived from the hook script's own path
     (reliable even when cwd is a subdirectory), falling back to walking
@@ -39,8 +71,9 @@ def check_chainlink_initialized():
     # Primary: resolve from script location (.claude/hooks/ -> project root)
     try:
         root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        if os.path.isdir(os.path.join(root, ".chainlink")):
-            return True
+        candidate = os.path.join(root, ".chainlink")
+        if os.path.isdir(candidate):
+            return candidate
     except (NameError, OSError):
         pass
 
@@ -49,37 +82,40 @@ def check_chainlink_initialized():
     while True:
         candidate = os.path.join(current, ".chainlink")
         if os.path.isdir(candidate):
-            return True
+            return candidate
         parent = os.path.dirname(current)
         if parent == current:
             break
         current = parent
 
-    return False
+    return None
+
+
+def check_chainlink_initialized():
+    """Check if .chainlink directory exists."""
+    return find_chainlink_dir() is not None
 
 
-def get_session_age_minutes():
+def get_session_age_minutes(session_status):
     """Parse session status to get duration in minutes. Returns None if no active session."""
-    result = run_chainlink(["session", "status"])
-    if not result or "Session #" not in result:
+    if not session_status or "Session #" not in session_status:
         return None
-    match = re.search(r'Duration:\s*(\d+)\s*minutes', result)
+    match = SESSION_DURATION_RE.search(session_status)
     if match:
         return int(match.group(1))
     return None
 
 
-def has_active_session():
-    """Check if there's an active chainlink session."""
-    result = run_chainlink(["session", "status"])
-    if result and "Session #" in result and "(started" in result:
+def has_active_session(session_status):
+    """Check if session status output shows an active chainlink session."""
+    if session_status and "Session #" in session_status and "(started" in session_status:
         return True
     return False
 
 
-def auto_end_stale_session():
+def auto_end_stale_session(session_status):
     """End session if it's been open longer than STALE_SESSION_HOURS."""
-    age_minutes = get_session_age_minutes()
+    age_minutes = get_session_age_minutes(session_status)
     if age_minutes is not None and age_minutes > STALE_SESSION_HOURS * 60:
         run_chainlink([
             "session", "end", "--notes",
@@ -89,19 +125,19 @@ def auto_end_stale_session():
     return False
 
 
-def detect_resume_event():
+def detect_resume_event(session_status):
     """Detect if this is a resume (context compression) vs fresh startup.
 
     If there's already an active session, this is a resume event.
     """
-    return has_active_session()
+    return has_active_session(session_status)
 
 
 def get_last_action_from_status(status_text):
     """Extract last action from session status output."""
     if not status_text:
         return None
-    match = re.search(r'Last action:\s*(.+)', status_text)
+    match = LAST_ACTION_RE.search(status_text)
     if match:
         return match.group(1).strip()
     return None
@@ -112,7 +148,7 @@ def auto_comment_on_resume(session_status):
     if not session_status:
         return
     # Extract working issue ID
-    match = re.search(r'Working on: #(\d+)', session_status)
+    match = WORKING_ON_RE.search(session_status)
     if not match:
         return
     issue_id = match.group(1)
@@ -133,12 +169,16 @@ def main():
 
     context_parts = ["<chainlink-session-context>"]
 
-    is_resume = detect_resume_event()
+    # One status read serves the resume, stale-session and auto-start checks
+    # and the breadcrumb: nothing below changes the session before it is
+    # either ended as stale or started afresh.
+    session_status = run_chainlink(["session", "status"])
+    is_resume = detect_resume_event(session_status)
 
     # Check for stale session and auto-end it
     stale_ended = False
     if is_resume:
-        stale_ended = auto_end_stale_session()
+        stale_ended = auto_end_stale_session(session_status)
         if stale_ended:
             is_resume = False
             context_parts.append(
@@ -146,16 +186,12 @@ def main():
                 f"{STALE_SESSION_HOURS} hours). Handoff notes may be incomplete."
             )
 
-    # Get handoff notes from previous session before starting new one
-    last_handoff = run_chainlink(["session", "last-handoff"])
-
     # Auto-start session if none active
-    if not has_active_session():
+    if not is_resume:
         run_chainlink(["session", "start"])
 
     # If resuming, add breadcrumb comment and context
     if is_resume:
-        session_status = run_chainlink(["session", "status"])
         auto_comment_on_resume(session_status)
 
         last_action = get_last_action_from_status(session_status)
@@ -172,22 +208,20 @@ def main():
                 "No last action was recorded. Use `chainlink session action \"...\"` to track progress."
             )
 
+    # Handoff notes come from the last ended session, which starting a new
+    # session doesn't touch, so they are fetched alongside the rest
+    last_handoff, session_status, ready_issues, open_issues = get_session_context()
+
     # Include previous session handoff notes if available
     if last_handoff and "No previous" not in last_handoff:
         context_parts.append(f"## Previous Session Handoff\n{last_handoff}")
 
-    # Try to get session status
-    session_status = run_chainlink(["session", "status"])
     if session_status:
         context_parts.append(f"## Current Session\n{session_status}")
 
-    # Get ready issues (unblocked work)
-    ready_issues = run_chainlink(["ready"])
     if ready_issues:
         context_parts.append(f"## Ready Issues (unblocked)\n{ready_issues}")
 
-    # Get open issues summary
-    open_issues = run_chainlink(["list", "-s", "open"])
     if open_issues:
         context_parts.append(f"## Open Issues\n{open_issues}")
 
@@ -200,7 +234,10 @@ def main():
 - End with handoff notes: `chainlink session end --notes "..."`
 </chainlink-session-context>""")
 
-    print("\n\n".join(context_parts))
+    # One encode and one write for the whole context, as UTF-8 regardless of
+    # the console code page (issue titles aren't limited to ASCII)
+    sys.stdout.buffer.write(("\n\n".join(context_parts) + "\n").encode("utf-8"))
+    sys.stdout.flush()
     sys.exit(0)
 
 
@@ -5,13 +5,8 @@ is being actively worked on. Forces issue creation before code changes.
 """
 
 import json
-import subprocess
 import sys
 import os
-import io
-
-# Fix Windows encoding issues
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 # Defaults — overridden by .chainlink/hook-config.json if present
 DEFAULT_BLOCKED_GIT = [
@@ -30,38 +25,92 @@ DEFAULT_ALLOWED_BASH = [
     "ls", "dir", "pwd", "echo",
 ]
 
+# Separators after which a chained command can start (&& git push, ; git commit)
+CHAIN_SEPARATORS = ("&& ", "; ", "| ")
+
+# Claude Code's own memory/config directory, normalized once for prefix tests
+CLAUDE_DIR_PREFIX = os.path.normcase(os.path.abspath(os.path.expanduser("~/.claude"))) + os.sep
+
+# Messages are emitted as UTF-8 bytes (see write_message), so stdout never
+# needs re-encoding setup on Windows
+BLOCKED_GIT_MSG = (
+    "MANDATORY COMPLIANCE — DO NOT ATTEMPT TO WORK AROUND THIS BLOCK.\n\n"
+    "Git mutation commands (commit, push, merge, rebase, reset, etc.) are "
+    "PERMANENTLY FORBIDDEN. The human performs all git write operations.\n\n"
+    "You MUST NOT:\n"
+    "  - Retry this command\n"
+    "  - Rewrite the command to achieve the same effect\n"
+    "  - Use a different tool to perform git mutations\n"
+    "  - Ask the user if you should bypass this restriction\n\n"
+    "You MUST instead:\n"
+    "  - Inform the user that this is a manual step for them\n"
+    "  - Continue with your other work\n\n"
+    "Read-only git commands (status, diff, log, show, branch) are allowed."
+)
+
+STRICT_MSG = (
+    "MANDATORY COMPLIANCE — DO NOT ATTEMPT TO WORK AROUND THIS BLOCK.\n\n"
+    "You cannot Write, Edit, or run Bash commands without an active chainlink issue. "
+    "This is a hard requirement enforced by the project, not a suggestion.\n\n"
+    "You MUST NOT:\n"
+    "  - Retry the same tool call hoping it will work\n"
+    "  - Try alternative tools or approaches to bypass this check\n"
+    "  - Proceed without creating an issue first\n"
+    "  - Tell the user the hook is preventing you from working\n\n"
+    "You MUST do exactly this, right now, before anything else:\n\n"
+    "  chainlink quick \"<describe what you are about to do>\" -p <priority> -l <label>\n\n"
+    "This single command creates an issue AND sets it as your active work item. "
+    "After running it, your tool calls will succeed.\n\n"
+    "If an issue already exists for this work, use:\n"
+    "  chainlink list -s open\n"
+    "  chainlink session work <id>\n\n"
+    "This is how the project tracks work. Comply, then continue."
+)
+
+NORMAL_MSG = (
+    "Reminder: No active chainlink issue. You should create one before making changes.\n\n"
+    "  chainlink quick \"<describe what you are about to do>\" -p <priority> -l <label>\n\n"
+    "Or pick an existing issue:\n"
+    "  chainlink list -s open\n"
+    "  chainlink session work <id>"
+)
+
+
+def write_message(message):
+    """Write a hook message to stdout as UTF-8, whatever the console encoding."""
+    sys.stdout.buffer.write(message.encode('utf-8') + b"\n")
+    sys.stdout.flush()
+
 
 def load_config(chainlink_dir):
     """Load hook config from .chainlink/hook-config.json, falling back to defaults.
 
-    Returns (tracking_mode, blocked_git, allowed_bash).
+    Returns (tracking_mode, blocked_git, allowed_bash), the command lists
+    as tuples so they can be handed straight to str.startswith.
     tracking_mode is one of: "strict", "normal", "relaxed".
       strict  — block Write/Edit/Bash without an active issue
       normal  — remind (print warning) but don't block
       relaxed — no issue-tracking enforcement, only git blocks
     """
-    blocked = list(DEFAULT_BLOCKED_GIT)
-    allowed = list(DEFAULT_ALLOWED_BASH)
+    blocked = tuple(DEFAULT_BLOCKED_GIT)
+    allowed = tuple(DEFAULT_ALLOWED_BASH)
     mode = "strict"
 
     if not chainlink_dir:
         return mode, blocked, allowed
 
-    config_path = os.path.join(chainlink_dir, "hook-config.json")
-    if not os.path.isfile(config_path):
-        return mode, blocked, allowed
-
+    # A missing file surfaces as OSError below, so no separate existence check
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        with open(os.path.join(chainlink_dir, "hook-config.json"), "rb") as f:
+            config = json.loads(f.read())
 
         if config.get("tracking_mode") in ("strict", "normal", "relaxed"):
             mode = config["tracking_mode"]
         if "blocked_git_commands" in config:
-            blocked = config["blocked_git_commands"]
+            blocked = tuple(config["blocked_git_commands"])
         if "allowed_bash_prefixes" in config:
-            allowed = config["allowed_bash_prefixes"]
-    except (json.JSONDecodeError, OSError):
+            allowed = tuple(config["allowed_bash_prefixes"])
+    except (ValueError, OSError):
         pass
 
     return mode, blocked, allowed
@@ -104,6 +153,7 @@ def find_chainlink_dir():
 
 def run_chainlink(args):
     """Run a chainlink command and return output."""
+    import subprocess  # deferred: only needed once the cheap checks pass
     try:
         result = subprocess.run(
             ["chainlink"] + args,
@@ -119,23 +169,24 @@ def run_chainlink(args):
 def is_blocked_git(input_data, blocked_list):
     """Check if a Bash command is a blocked git mutation. Always denied."""
     command = input_data.get("tool_input", {}).get("command", "").strip()
-    for blocked in blocked_list:
-        if command.startswith(blocked):
-            return True
+    if command.startswith(blocked_list):
+        return True
     # Also catch piped/chained git mutations: && git push, ; git commit, etc.
-    for blocked in blocked_list:
-        if f"&& {blocked}" in command or f"; {blocked}" in command or f"| {blocked}" in command:
-            return True
+    # Only the text right after each separator can start a chained command,
+    # so test the prefixes there instead of searching for every combination.
+    for sep in CHAIN_SEPARATORS:
+        index = command.find(sep)
+        while index != -1:
+            if command.startswith(blocked_list, index + len(sep)):
+                return True
+            index = command.find(sep, index + 1)
     return False
 
 
 def is_allowed_bash(input_data, allowed_list):
     """Check if a Bash command is on the allow list (read-only/infra)."""
     command = input_data.get("tool_input", {}).get("command", "").strip()
-    for prefix in allowed_list:
-        if command.startswith(prefix):
-            return True
-    return False
+    return command.startswith(allowed_list)
 
 
 def is_claude_memory_path(input_data):
@@ -143,19 +194,16 @@ def is_claude_memory_path(input_data):
     file_path = input_data.get("tool_input", {}).get("file_path", "")
     if not file_path:
         return False
-    home = os.path.expanduser("~")
-    claude_dir = os.path.join(home, ".claude")
     try:
-        return os.path.normcase(os.path.abspath(file_path)).startswith(
-            os.path.normcase(os.path.abspath(claude_dir))
-        )
+        return os.path.normcase(os.path.abspath(file_path)).startswith(CLAUDE_DIR_PREFIX)
     except (ValueError, OSError):
         return False
 
 
 def main():
     try:
-        input_data = json.load(sys.stdin)
+        # Raw bytes: json detects UTF-8 itself, skipping the text stdin layer
+        input_data = json.loads(sys.stdin.buffer.read())
         tool_name = input_data.get('tool_name', '')
     except (json.JSONDecodeError, Exception):
         tool_name = ''
@@ -173,20 +221,7 @@ def main():
 
     # PERMANENT BLOCK: git mutation commands are never allowed (all modes)
     if tool_name == 'Bash' and is_blocked_git(input_data, blocked_git):
-        print(
-            "MANDATORY COMPLIANCE — DO NOT ATTEMPT TO WORK AROUND THIS BLOCK.\n\n"
-            "Git mutation commands (commit, push, merge, rebase, reset, etc.) are "
-            "PERMANENTLY FORBIDDEN. The human performs all git write operations.\n\n"
-            "You MUST NOT:\n"
-            "  - Retry this command\n"
-            "  - Rewrite the command to achieve the same effect\n"
-            "  - Use a different tool to perform git mutations\n"
-            "  - Ask the user if you should bypass this restriction\n\n"
-            "You MUST instead:\n"
-            "  - Inform the user that this is a manual step for them\n"
-            "  - Continue with your other work\n\n"
-            "Read-only git commands (status, diff, log, show, branch) are allowed."
-        )
+        write_message(BLOCKED_GIT_MSG)
         sys.exit(2)
 
     # Allow read-only / infrastructure Bash commands through
@@ -211,39 +246,12 @@ def main():
         sys.exit(0)
 
     # No active work item — behavior depends on mode
-    strict_msg = (
-        "MANDATORY COMPLIANCE — DO NOT ATTEMPT TO WORK AROUND THIS BLOCK.\n\n"
-        "You cannot Write, Edit, or run Bash commands without an active chainlink issue. "
-        "This is a hard requirement enforced by the project, not a suggestion.\n\n"
-        "You MUST NOT:\n"
-        "  - Retry the same tool call hoping it will work\n"
-        "  - Try alternative tools or approaches to bypass this check\n"
-        "  - Proceed without creating an issue first\n"
-        "  - Tell the user the hook is preventing you from working\n\n"
-        "You MUST do exactly this, right now, before anything else:\n\n"
-        "  chainlink quick \"<describe what you are about to do>\" -p <priority> -l <label>\n\n"
-        "This single command creates an issue AND sets it as your active work item. "
-        "After running it, your tool calls will succeed.\n\n"
-        "If an issue already exists for this work, use:\n"
-        "  chainlink list -s open\n"
-        "  chainlink session work <id>\n\n"
-        "This is how the project tracks work. Comply, then continue."
-    )
-
-    normal_msg = (
-        "Reminder: No active chainlink issue. You should create one before making changes.\n\n"
-        "  chainlink quick \"<describe what you are about to do>\" -p <priority> -l <label>\n\n"
-        "Or pick an existing issue:\n"
-        "  chainlink list -s open\n"
-        "  chainlink session work <id>"
-    )
-
     if tracking_mode == "strict":
-        print(strict_msg)
+        write_message(STRICT_MSG)
         sys.exit(2)
     else:
         # normal mode: remind but allow
-        print(normal_msg)
+        write_message(NORMAL_MSG)
         sys.exit(0)
 
 
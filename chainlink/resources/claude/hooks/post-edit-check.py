@@ -4,66 +4,234 @@ Post-edit hook that detects stub patterns, runs linters, and reminds about tests
 Runs after Write/Edit tool usage.
 """
 
+import functools
+import hashlib
+import io
 import json
+import mmap
 import sys
 import os
 import re
 import subprocess
-import glob
 import time
-
-# Stub patterns to detect (compiled regex for performance)
+from collections import deque
+
+try:
+    import fcntl
+except ImportError:  # Windows: cache access is unlocked
+    fcntl = None
+
+# Hook stdin/stdout JSON goes through orjson when it is installed
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+# Stub patterns to detect: (regex, description, required literal). Files are
+# scanned as raw bytes, whole-buffer, with MULTILINE, so horizontal whitespace
+# is spelled [ \t] to keep every match on a single line and \r? lets $ match
+# CRLF line endings. The literal is a lowercase substring every match must
+# contain; patterns whose literal is absent from the file are dropped before
+# the regex pass. Repeats are possessive (*+, ++) wherever the next token can
+# never match what they consumed, so a failed attempt never backtracks.
+# Patterns are tried in list order at each position, so a specific pattern
+# must come before a generic one that matches the same start (todo! vs TODO).
 STUB_PATTERNS = [
-    (r'\bTODO\b', 'TODO comment'),
-    (r'\bFIXME\b', 'FIXME comment'),
-    (r'\bXXX\b', 'XXX marker'),
-    (r'\bHACK\b', 'HACK marker'),
-    (r'^\s*pass\s*$', 'bare pass statement'),
-    (r'^\s*\.\.\.\s*$', 'ellipsis placeholder'),
-    (r'\bunimplemented!\s*\(\s*\)', 'unimplemented!() macro'),
-    (r'\btodo!\s*\(\s*\)', 'todo!() macro'),
-    (r'\bpanic!\s*\(\s*"not implemented', 'panic not implemented'),
-    (r'raise\s+NotImplementedError\s*\(\s*\)', 'bare NotImplementedError'),
-    (r'#\s*implement\s*(later|this|here)', 'implement later comment'),
-    (r'//\s*implement\s*(later|this|here)', 'implement later comment'),
-    (r'def\s+\w+\s*\([^)]*\)\s*:\s*(pass|\.\.\.)\s*$', 'empty function'),
-    (r'fn\s+\w+\s*\([^)]*\)\s*\{\s*\}', 'empty function body'),
-    (r'return\s+None\s*#.*stub', 'stub return'),
+    (rb'\btodo![ \t]*+\([ \t]*+\)', 'todo!() macro', b'todo!'),
+    (rb'\bTODO\b', 'TODO comment', b'todo'),
+    (rb'\bFIXME\b', 'FIXME comment', b'fixme'),
+    (rb'\bXXX\b', 'XXX marker', b'xxx'),
+    (rb'\bHACK\b', 'HACK marker', b'hack'),
+    (rb'^[ \t]*+pass[ \t]*+\r?$', 'bare pass statement', b'pass'),
+    (rb'^[ \t]*+\.\.\.[ \t]*+\r?$', 'ellipsis placeholder', b'...'),
+    (rb'\bunimplemented![ \t]*+\([ \t]*+\)', 'unimplemented!() macro', b'unimplemented!'),
+    (rb'\bpanic![ \t]*+\([ \t]*+"not implemented', 'panic not implemented', b'panic!'),
+    (rb'raise[ \t]++NotImplementedError[ \t]*+\([ \t]*+\)', 'bare NotImplementedError', b'notimplementederror'),
+    (rb'#[ \t]*+implement[ \t]*+(later|this|here)', 'implement later comment', b'implement'),
+    (rb'//[ \t]*+implement[ \t]*+(later|this|here)', 'implement later comment', b'implement'),
+    (rb'^[ \t]*+(?:async[ \t]++)?def[ \t]++\w++[ \t]*+\([^)\n]*+\)[ \t]*+:[ \t]*+(pass|\.\.\.)[ \t]*+\r?$',
+     'empty function', b'def'),
+    (rb'\bfn[ \t]++\w++[ \t]*+\([^)\n]*+\)[ \t]*+\{[ \t]*+\}', 'empty function body', b'fn'),
+    (rb'return[ \t]++None[ \t]*+#.*stub', 'stub return', b'stub'),
 ]
 
-COMPILED_PATTERNS = [(re.compile(p, re.IGNORECASE | re.MULTILINE), desc) for p, desc in STUB_PATTERNS]
+STUB_DESCS = {f"p{i}": desc for i, (_, desc, _) in enumerate(STUB_PATTERNS)}
 
 
-def check_for_stubs(file_path):
-    """Check file for stub patterns. Returns list of (line_num, pattern_desc, line_content)."""
-    if not os.path.exists(file_path):
-        return []
+@functools.lru_cache(maxsize=None)
+def stub_regex(active):
+    """Compile the given STUB_PATTERNS indices into one alternation.
+
+    The named group that matched identifies the pattern, so the file is
+    scanned in a single regex pass.
+    """
+    pattern = b"|".join(b"(?P<p%d>%s)" % (i, STUB_PATTERNS[i][0]) for i in active)
+    flags = re.IGNORECASE | re.MULTILINE
+    try:
+        return re.compile(pattern, flags)
+    except re.error:
+        # Possessive quantifiers need Python 3.11+. The greedy forms match
+        # the same text; every repeated class is followed by a token it
+        # cannot match, so backtracking stays bounded by the line length.
+        return re.compile(pattern.replace(b'*+', b'*').replace(b'++', b'+'), flags)
+
+
+NOT_IMPLEMENTED_WITH_REASON = re.compile(rb'NotImplementedError\s*\(\s*["\'][^"\']+["\']')
+
+# Only the first few findings are shown, so scanning stops after this many
+STUB_EARLY_STOP = 16
+
+# Files larger than STUB_SCAN_MAX_BYTES only have their head scanned
+STUB_SCAN_MAX_BYTES = 1_000_000
+STUB_SCAN_HEAD_BYTES = 65536
+
+# The literal prefilter lowercases the mapped file this many bytes at a time,
+# so it never holds a full-size copy of the mmap
+STUB_PREFILTER_CHUNK = 65536
+STUB_LITERALS = frozenset(literal for _, _, literal in STUB_PATTERNS)
+STUB_LITERAL_OVERLAP = max(map(len, STUB_LITERALS)) - 1
+
+
+def check_for_stubs(file_path, max_findings=STUB_EARLY_STOP):
+    """Check file for stub patterns. Returns list of (line_num, pattern_desc, line_content).
 
+    Stops scanning once max_findings stubs have been found. Files over
+    STUB_SCAN_MAX_BYTES (typically generated) only have their first
+    STUB_SCAN_HEAD_BYTES scanned.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            lines = content.split('\n')
-    except (OSError, Exception):
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return []  # mmap cannot map an empty file
+            limit = size if size <= STUB_SCAN_MAX_BYTES else STUB_SCAN_HEAD_BYTES
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return scan_for_stubs(content, limit, max_findings)
+    except (OSError, ValueError):
+        return []
+
+
+def find_stub_literals(content, limit):
+    """Return the STUB_LITERALS present, ignoring case, in the first limit bytes of content.
+
+    Chunks overlap by STUB_LITERAL_OVERLAP bytes so a literal spanning a
+    chunk boundary is still seen, and the scan stops once every literal
+    has turned up.
+    """
+    missing = set(STUB_LITERALS)
+    start = 0
+    while start < limit and missing:
+        chunk = content[start:min(limit, start + STUB_PREFILTER_CHUNK + STUB_LITERAL_OVERLAP)].lower()
+        missing.difference_update([literal for literal in missing if literal in chunk])
+        start += STUB_PREFILTER_CHUNK
+    return STUB_LITERALS - missing
+
+
+def scan_for_stubs(content, limit, max_findings):
+    """Scan the first limit bytes of a bytes-like buffer for stub patterns; see check_for_stubs."""
+    # Literal prefilter: substring checks run in C and usually rule out most
+    # patterns, leaving a much smaller alternation for the regex engine.
+    present = find_stub_literals(content, limit)
+    active = tuple(i for i, (_, _, literal) in enumerate(STUB_PATTERNS) if literal in present)
+    if not active:
         return []
 
     findings = []
-    for line_num, line in enumerate(lines, 1):
-        for pattern, desc in COMPILED_PATTERNS:
-            if pattern.search(line):
-                if 'NotImplementedError' in line and re.search(r'NotImplementedError\s*\(\s*["\'][^"\']+["\']', line):
-                    continue
-                findings.append((line_num, desc, line.strip()[:60]))
+    line_num = 1
+    line_start = 0
+    for match in stub_regex(active).finditer(content, 0, limit):
+        pos = match.start()
+        # Advance the line counter incrementally from the previous match
+        newlines = content[line_start:pos].count(b'\n')
+        if newlines:
+            line_num += newlines
+            line_start = content.rfind(b'\n', line_start, pos) + 1
+        line_end = content.find(b'\n', pos, limit)
+        line = content[line_start:line_end if line_end != -1 else limit]
+        if b'NotImplementedError' in line and NOT_IMPLEMENTED_WITH_REASON.search(line):
+            continue
+        # Only the displayed line is ever decoded
+        findings.append((line_num, STUB_DESCS[match.lastgroup], line.decode('utf-8', 'ignore').strip()[:60]))
+        if len(findings) >= max_findings:
+            break
 
     return findings
 
 
+# Generated, vendored or build-output files are never checked: nobody should
+# hand-edit them, and minified code is the worst-case input for the scanner
+GENERATED_NAME_MARKERS = ('.min.', '.generated.')
+VENDORED_DIRS = frozenset({
+    'node_modules', '.git', 'vendor', 'third_party', 'dist', 'build',
+    'target', '.venv', '__pycache__',
+})
+MINIFIED_SNIFF_BYTES = 2048
+
+
+def is_generated_or_vendored(file_path, base_dir):
+    """Check if file looks generated by name or lives in a vendored/build tree.
+
+    Only directories below base_dir (see vendor_base_dir) count, so a project
+    that itself lives under e.g. /tmp/build/ is still checked.
+    """
+    basename = os.path.basename(file_path).lower()
+    if any(marker in basename for marker in GENERATED_NAME_MARKERS):
+        return True
+    if not base_dir:
+        return False
+    try:
+        relative = os.path.relpath(file_path, base_dir)
+    except ValueError:  # Windows: file and root on different drives
+        return False
+    return not VENDORED_DIRS.isdisjoint(os.path.dirname(relative).split(os.sep))
+
+
+def looks_minified(file_path):
+    """Check if the file's first line runs past MINIFIED_SNIFF_BYTES."""
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(MINIFIED_SNIFF_BYTES)
+    except OSError:
+        return False
+    return len(head) == MINIFIED_SNIFF_BYTES and b'\n' not in head
+
+
+@functools.lru_cache(maxsize=32)
+def stat_path(path):
+    """os.stat(path), or None if it does not exist.
+
+    Cached for the lifetime of this hook process: the same marker files are
+    probed by the root walk, the linter and the test reminder.
+    """
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+# Files whose presence marks a project root, and the subset marking the
+# repository that contains it
+PROJECT_ROOT_MARKERS = (
+    'Cargo.toml', 'package.json', 'go.mod', 'setup.py',
+    'pyproject.toml', '.git',
+)
+REPO_ROOT_MARKERS = ('.chainlink', '.git')
+
+@functools.lru_cache(maxsize=None)
 def find_project_root(file_path, marker_files):
-    """Walk up from file_path looking for project root markers."""
+    """Walk up from file_path looking for project root markers.
+
+    marker_files must be a tuple so the result can be cached.
+    """
     current = os.path.dirname(os.path.abspath(file_path))
     for _ in range(10):  # Max 10 levels up
-        for marker in marker_files:
-            if os.path.exists(os.path.join(current, marker)):
-                return current
+        if any(stat_path(os.path.join(current, marker)) for marker in marker_files):
+            return current
         parent = os.path.dirname(current)
         if parent == current:
             break
@@ -71,217 +239,528 @@ def find_project_root(file_path, marker_files):
     return None
 
 
-def run_linter(file_path, max_errors=10):
-    """Run appropriate linter and return first N errors."""
-    ext = os.path.splitext(file_path)[1].lower()
-    errors = []
+def find_outermost_root(file_path, marker_files):
+    """Like find_project_root, but keep walking and return the highest match."""
+    root = None
+    current = os.path.dirname(os.path.abspath(file_path))
+    for _ in range(10):  # Max 10 levels up
+        if any(stat_path(os.path.join(current, marker)) for marker in marker_files):
+            root = current
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    return root
+
 
+def vendor_base_dir(file_path):
+    """Directory below which VENDORED_DIRS mark a vendored or build tree.
+
+    Vendored packages usually carry their own manifest (node_modules/<pkg>/
+    package.json, vendor/<pkg>/pyproject.toml), so the nearest project root
+    is too close. Use the enclosing repository instead, or failing that the
+    outermost directory holding a project marker.
+    """
+    return (find_project_root(file_path, REPO_ROOT_MARKERS)
+            or find_outermost_root(file_path, PROJECT_ROOT_MARKERS))
+
+
+def language_root(file_path, project_root, marker_files):
+    """Return project_root if it holds one of marker_files, else walk up for them.
+
+    main() has already located the project root; reusing it avoids a second
+    upward walk for the common case where it is also the language root.
+    """
+    if project_root and any(stat_path(os.path.join(project_root, m)) for m in marker_files):
+        return project_root
+    return find_project_root(file_path, marker_files)
+
+
+# Linters whose output depends only on the edited file, so their results can
+# be cached by content hash (clippy and go vet check the whole project)
+CACHEABLE_LINT_EXTS = ('.py', '.js', '.ts', '.tsx', '.jsx')
+LINT_CACHE_MAX_ENTRIES = 200
+
+# Files marking the directory eslint runs from; they double as its config
+ESLINT_ROOT_MARKERS = ('package.json', '.eslintrc', '.eslintrc.js', '.eslintrc.json')
+
+# Config files a cacheable linter reads, by extension. Their mtimes are part
+# of the cache key, so editing a config invalidates the cached results.
+LINT_CONFIG_FILES = {
+    '.py': ('.flake8', 'setup.cfg', 'tox.ini', 'pyproject.toml'),
+    '.js': ESLINT_ROOT_MARKERS,
+    '.ts': ESLINT_ROOT_MARKERS,
+    '.tsx': ESLINT_ROOT_MARKERS,
+    '.jsx': ESLINT_ROOT_MARKERS,
+}
+
+
+def files_digest(file_paths):
+    """Return a BLAKE2b hex digest over the files' paths and bytes, or None if one is unreadable."""
+    h = hashlib.blake2b(digest_size=16)
     try:
-        if ext == '.rs':
-            # Rust: run cargo clippy from project root
-            project_root = find_project_root(file_path, ['Cargo.toml'])
-            if project_root:
-                result = subprocess.run(
-                    ['cargo', 'clippy', '--message-format=short', '--quiet'],
-                    cwd=project_root,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                if result.stderr:
-                    for line in result.stderr.split('\n'):
-                        if line.strip() and ('error' in line.lower() or 'warning' in line.lower()):
-                            errors.append(line.strip()[:100])
-                            if len(errors) >= max_errors:
-                                break
-
-        elif ext == '.py':
-            # Python: try flake8, fall back to py_compile
+        for path in file_paths:
+            with open(path, 'rb') as f:
+                h.update(path.encode('utf-8', 'surrogateescape'))
+                h.update(b'\0')
+                h.update(f.read())
+                h.update(b'\0')
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def lint_config_stamp(file_path, ext, project_root):
+    """Return the mtimes of the linter config files for file_path as a string."""
+    config_files = LINT_CONFIG_FILES.get(ext, ())
+    config_root = language_root(file_path, project_root, config_files) or project_root
+    if not config_root:
+        return ''
+    stamps = []
+    for name in config_files:
+        st = stat_path(os.path.join(config_root, name))
+        stamps.append(str(st.st_mtime_ns) if st else '-')
+    return ','.join(stamps)
+
+
+def lock_file(f, exclusive=False):
+    """flock an open file where supported; released when the file is closed."""
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+
+def lint_cache_lookup(cache_path, key):
+    """Return cached linter errors for key, or None on a miss."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            lock_file(f)
+            return json.load(f).get(key)
+    except (OSError, ValueError):
+        return None
+
+
+def lint_cache_store(cache_path, key, errors):
+    """Store linter errors for key, evicting the oldest entries past the cap."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'a+', encoding='utf-8') as f:
+            lock_file(f, exclusive=True)
+            f.seek(0)
             try:
-                result = subprocess.run(
-                    ['flake8', '--max-line-length=120', file_path],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                for line in result.stdout.split('\n'):
-                    if line.strip():
-                        errors.append(line.strip()[:100])
-                        if len(errors) >= max_errors:
-                            break
-            except FileNotFoundError:
-                # flake8 not installed, try py_compile
-                result = subprocess.run(
-                    ['python', '-m', 'py_compile', file_path],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                if result.stderr:
-                    errors.append(result.stderr.strip()[:200])
-
-        elif ext in ('.js', '.ts', '.tsx', '.jsx'):
-            # JavaScript/TypeScript: try eslint
-            project_root = find_project_root(file_path, ['package.json', '.eslintrc', '.eslintrc.js', '.eslintrc.json'])
-            if project_root:
-                try:
-                    result = subprocess.run(
-                        ['npx', 'eslint', '--format=compact', file_path],
-                        cwd=project_root,
-                        capture_output=True,
-                        text=True,
-                        timeout=30
-                    )
-                    for line in result.stdout.split('\n'):
-                        if line.strip() and (':' in line):
-                            errors.append(line.strip()[:100])
-                            if len(errors) >= max_errors:
-                                break
-                except FileNotFoundError:
-                    pass
-
-        elif ext == '.go':
-            # Go: run go vet
-            project_root = find_project_root(file_path, ['go.mod'])
-            if project_root:
-                result = subprocess.run(
-                    ['go', 'vet', './...'],
-                    cwd=project_root,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                if result.stderr:
-                    for line in result.stderr.split('\n'):
-                        if line.strip():
-                            errors.append(line.strip()[:100])
-                            if len(errors) >= max_errors:
-                                break
+                cache = json.load(f)
+            except ValueError:
+                cache = {}
+            cache.pop(key, None)
+            cache[key] = errors
+            # Dicts keep insertion order, so the first keys are the oldest
+            while len(cache) > LINT_CACHE_MAX_ENTRIES:
+                del cache[next(iter(cache))]
+            f.seek(0)
+            f.truncate()
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
+def lint_rust(file_paths, project_root, max_errors):
+    """Run cargo clippy from the crate root."""
+    errors = []
+    project_root = language_root(file_paths[0], project_root, ('Cargo.toml',))
+    if project_root:
+        result = subprocess.run(
+            ['cargo', 'clippy', '--message-format=short', '--quiet'],
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        if result.stderr:
+            for line in result.stderr.split('\n'):
+                if line.strip() and ('error' in line.lower() or 'warning' in line.lower()):
+                    errors.append(line.strip()[:100])
+                    if len(errors) >= max_errors:
+                        break
+    return errors
+
+
+def lint_python(file_paths, project_root, max_errors):
+    """Run flake8, falling back to py_compile."""
+    errors = []
+    try:
+        result = subprocess.run(
+            ['flake8', '--max-line-length=120', *file_paths],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        for line in result.stdout.split('\n'):
+            if line.strip():
+                errors.append(line.strip()[:100])
+                if len(errors) >= max_errors:
+                    break
+    except FileNotFoundError:
+        # flake8 not installed, try py_compile
+        result = subprocess.run(
+            ['python', '-m', 'py_compile', *file_paths],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        if result.stderr:
+            errors.append(result.stderr.strip()[:200])
+    return errors
+
 
+def lint_javascript(file_paths, project_root, max_errors):
+    """Run eslint on the files from the package root."""
+    errors = []
+    project_root = language_root(file_paths[0], project_root, ESLINT_ROOT_MARKERS)
+    if project_root:
+        try:
+            result = subprocess.run(
+                ['npx', 'eslint', '--format=compact', *file_paths],
+                cwd=project_root,
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            for line in result.stdout.split('\n'):
+                if line.strip() and (':' in line):
+                    errors.append(line.strip()[:100])
+                    if len(errors) >= max_errors:
+                        break
+        except FileNotFoundError:
+            pass
+    return errors
+
+
+def lint_go(file_paths, project_root, max_errors):
+    """Run go vet from the module root."""
+    errors = []
+    project_root = language_root(file_paths[0], project_root, ('go.mod',))
+    if project_root:
+        result = subprocess.run(
+            ['go', 'vet', './...'],
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        if result.stderr:
+            for line in result.stderr.split('\n'):
+                if line.strip():
+                    errors.append(line.strip()[:100])
+                    if len(errors) >= max_errors:
+                        break
+    return errors
+
+
+LINTERS = {
+    '.rs': lint_rust,
+    '.py': lint_python,
+    '.js': lint_javascript,
+    '.ts': lint_javascript,
+    '.tsx': lint_javascript,
+    '.jsx': lint_javascript,
+    '.go': lint_go,
+}
+
+
+def run_linter(file_paths, ext, project_root=None, max_errors=10, cache_dir=None):
+    """Run the linter for ext over file_paths in one invocation and return first N errors.
+
+    File-scoped linter results are cached in cache_dir by content hash and
+    config file mtimes, so saving unchanged content does not spawn the linter
+    again.
+    """
+    linter = LINTERS.get(ext)
+    if not linter:
+        return []
+
+    cache_path = cache_key = None
+    if cache_dir and ext in CACHEABLE_LINT_EXTS:
+        digest = files_digest(file_paths)
+        if digest:
+            cache_path = os.path.join(cache_dir, 'lint-cache.json')
+            stamp = lint_config_stamp(file_paths[0], ext, project_root)
+            cache_key = f"{ext}:{stamp}:{digest}"
+            cached = lint_cache_lookup(cache_path, cache_key)
+            if cached is not None:
+                return cached[:max_errors]
+
+    try:
+        errors = linter(file_paths, project_root, max_errors)
     except subprocess.TimeoutExpired:
-        errors.append("(linter timed out)")
-    except (OSError, Exception) as e:
-        pass  # Linter not available, skip silently
+        return ["(linter timed out)"]
+    except (OSError, UnicodeDecodeError):
+        return []  # Linter not available or unreadable output, skip silently
+
+    if cache_key:
+        lint_cache_store(cache_path, cache_key, errors)
 
     return errors
 
 
+# Linters that check the whole project (or pay npx startup) run detached from
+# the hook; their results are reported on the next edit
+BACKGROUND_LINT_EXTS = ('.rs', '.go', '.js', '.ts', '.tsx', '.jsx')
+
+
+def background_lint_path(cache_dir, ext, project_root):
+    """Result file for the background linter serving ext in project_root."""
+    key = f"{LINTERS[ext].__name__}:{project_root}"
+    digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.lint")
+
+
+def take_background_lint(result_path):
+    """Return and consume the errors of a finished background lint, or None."""
+    try:
+        with open(result_path, 'r', encoding='utf-8') as f:
+            errors = json.load(f)
+        os.remove(result_path)
+    except (OSError, ValueError):
+        return None
+    return errors
+
+
+def start_background_lint(file_paths, ext, project_root, cache_dir, result_path):
+    """Re-run this script detached in --lint-worker mode.
+
+    Returns False without spawning while an earlier worker for result_path is
+    still running. The worker inherits the flock on result_path's .lock file,
+    so the lock is held exactly as long as the worker runs.
+    """
+    lock = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        if fcntl:
+            lock = open(f"{result_path}.lock", 'a')
+            try:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--lint-worker',
+             ext, project_root, cache_dir, result_path, *file_paths],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            pass_fds=(lock.fileno(),) if lock else (),
+        )
+    except OSError:
+        pass
+    finally:
+        if lock:
+            lock.close()
+    return True
+
+
+def lint_worker(ext, project_root, cache_dir, result_path, *file_paths):
+    """Background entry point: lint, then publish the errors atomically."""
+    errors = run_linter(list(file_paths), ext, project_root, cache_dir=cache_dir)
+    tmp_path = f"{result_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(errors, f)
+        os.replace(tmp_path, result_path)
+    except OSError:
+        pass
+
+
+LINT_DEBOUNCE_SECONDS = 10
+
+
+def queue_for_lint(cache_dir, file_path):
+    """Add file_path to the pending-lint queue and return the batch to lint now.
+
+    Edits within LINT_DEBOUNCE_SECONDS of the previous one only join the
+    queue (returns []). The first edit after an idle period takes the whole
+    deduplicated queue, so a burst of edits costs one linter run per language.
+    """
+    queue_path = os.path.join(cache_dir, 'pending-lint')
+    try:
+        last_edit = os.stat(queue_path).st_mtime
+    except OSError:
+        last_edit = 0
+    idle = time.time() - last_edit >= LINT_DEBOUNCE_SECONDS
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(queue_path, 'a+', encoding='utf-8') as f:
+            lock_file(f, exclusive=True)
+            f.write(file_path + '\n')
+            if not idle:
+                return []
+            f.seek(0)
+            batch = list(dict.fromkeys(line.rstrip('\n') for line in f if line.strip()))
+            # Truncating also bumps the mtime, which marks this edit's time
+            f.seek(0)
+            f.truncate()
+            return batch
+    except OSError:
+        return [file_path]
+
+
+def requeue_for_lint(cache_dir, file_paths):
+    """Put file_paths back on the pending-lint queue for a later edit to take."""
+    try:
+        with open(os.path.join(cache_dir, 'pending-lint'), 'a', encoding='utf-8') as f:
+            lock_file(f, exclusive=True)
+            f.writelines(path + '\n' for path in file_paths)
+    except OSError:
+        pass
+
+
+# Common test file name fragments and test directory names
+TEST_NAME_RE = re.compile(r'test_|_test\.|\.test\.|spec\.|_spec\.|tests\.|testing\.|mock\.|_mock\.')
+TEST_DIRS = frozenset({'test', 'tests', '__tests__', 'spec', 'specs', 'testing'})
+
+
 def is_test_file(file_path):
     """Check if file is a test file."""
     basename = os.path.basename(file_path).lower()
+    if TEST_NAME_RE.search(basename):
+        return True
     dirname = os.path.dirname(file_path).lower()
+    return not TEST_DIRS.isdisjoint(dirname.split(os.sep))
 
-    # Common test file patterns
-    test_patterns = [
-        'test_', '_test.', '.test.', 'spec.', '_spec.',
-        'tests.', 'testing.', 'mock.', '_mock.'
-    ]
-    # Common test directories
-    test_dirs = ['test', 'tests', '__tests__', 'spec', 'specs', 'testing']
 
-    for pattern in test_patterns:
-        if pattern in basename:
-            return True
+# Directories never descended into when searching for related tests
+TEST_SEARCH_SKIP_DIRS = frozenset({
+    'node_modules', '.git', 'dist', 'build', 'out', 'target', '.venv',
+    '__pycache__', '.gemini', '.chainlink',
+})
+
+
+def walk_for_tests(project_root, is_match, limit=5):
+    """Breadth-first walk of project_root returning up to limit matching paths.
 
-    for test_dir in test_dirs:
-        if test_dir in dirname.split(os.sep):
+    is_match(parents, name) receives the tuple of directory names between
+    project_root and the entry, and the entry's name. Hidden entries are
+    skipped (as glob does) and heavy directories are never descended into.
+    """
+    found = []
+    queue = deque([(project_root, ())])
+    while queue:
+        path, parents = queue.popleft()
+        try:
+            # Entries are consumed as the directory is read; the iterator is
+            # closed as soon as the limit is reached
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith('.'):
+                        continue
+                    if is_match(parents, name):
+                        found.append(entry.path)
+                        if len(found) >= limit:
+                            return found
+                    if name not in TEST_SEARCH_SKIP_DIRS and entry.is_dir(follow_symlinks=False):
+                        queue.append((entry.path, parents + (name,)))
+        except OSError:
+            continue
+    return found
+
+
+def rust_test_matcher(name, ext):
+    """Match files under tests/ or in any tests directory mentioning name."""
+    def is_match(parents, entry_name):
+        return name in entry_name and (parents[:1] == ('tests',) or parents[-1:] == ('tests',))
+    return is_match
+
+
+def python_test_matcher(name, ext):
+    """Match test_<name>.py, <name>_test.py, or tests/**/*<name>*.py."""
+    test_names = (f'test_{name}.py', f'{name}_test.py')
+
+    def is_match(parents, entry_name):
+        if entry_name in test_names:
             return True
+        return parents[:1] == ('tests',) and entry_name.endswith('.py') and name in entry_name[:-3]
+    return is_match
+
+
+def javascript_test_matcher(name, ext):
+    """Match <base>.test<ext>, <base>.spec<ext>, or __tests__/<base>*."""
+    base = name.replace('.test', '').replace('.spec', '')
+    test_names = (f'{base}.test{ext}', f'{base}.spec{ext}')
+
+    def is_match(parents, entry_name):
+        return entry_name in test_names or (parents[-1:] == ('__tests__',) and entry_name.startswith(base))
+    return is_match
+
 
-    return False
+TEST_MATCHERS = {
+    '.rs': rust_test_matcher,
+    '.py': python_test_matcher,
+    '.js': javascript_test_matcher,
+    '.ts': javascript_test_matcher,
+    '.tsx': javascript_test_matcher,
+    '.jsx': javascript_test_matcher,
+}
 
 
-def find_test_files(file_path, project_root):
+def find_test_files(file_path, ext, project_root):
     """Find test files related to source file."""
     if not project_root:
         return []
 
-    ext = os.path.splitext(file_path)[1]
-    basename = os.path.basename(file_path)
-    name_without_ext = os.path.splitext(basename)[0]
-
-    # Patterns to look for
-    test_patterns = []
-
-    if ext == '.rs':
-        # Rust: look for mod tests in same file, or tests/ directory
-        test_patterns = [
-            os.path.join(project_root, 'tests', '**', f'*{name_without_ext}*'),
-            os.path.join(project_root, '**', 'tests', f'*{name_without_ext}*'),
-        ]
-    elif ext == '.py':
-        test_patterns = [
-            os.path.join(project_root, '**', f'test_{name_without_ext}.py'),
-            os.path.join(project_root, '**', f'{name_without_ext}_test.py'),
-            os.path.join(project_root, 'tests', '**', f'*{name_without_ext}*.py'),
-        ]
-    elif ext in ('.js', '.ts', '.tsx', '.jsx'):
-        base = name_without_ext.replace('.test', '').replace('.spec', '')
-        test_patterns = [
-            os.path.join(project_root, '**', f'{base}.test{ext}'),
-            os.path.join(project_root, '**', f'{base}.spec{ext}'),
-            os.path.join(project_root, '**', '__tests__', f'{base}*'),
-        ]
-    elif ext == '.go':
-        test_patterns = [
-            os.path.join(os.path.dirname(file_path), f'{name_without_ext}_test.go'),
-        ]
+    name_without_ext = os.path.splitext(os.path.basename(file_path))[0]
 
-    found = []
-    for pattern in test_patterns:
-        found.extend(glob.glob(pattern, recursive=True))
+    if ext == '.go':
+        # Go: tests live next to the source file
+        test_file = os.path.join(os.path.dirname(file_path), f'{name_without_ext}_test.go')
+        return [test_file] if os.path.exists(test_file) else []
+
+    matcher = TEST_MATCHERS.get(ext)
+    if not matcher:
+        return []
+    return walk_for_tests(project_root, matcher(name_without_ext, ext))
 
-    return list(set(found))[:5]  # Limit to 5
 
+# Test command per extension: (marker file in project root, command) candidates
+# tried in order; a None marker always applies
+TEST_COMMANDS = {
+    '.rs': (('Cargo.toml', 'cargo test'),),
+    '.py': (('pytest.ini', 'pytest'), ('setup.py', 'python -m pytest')),
+    '.js': (('package.json', 'npm test'),),
+    '.ts': (('package.json', 'npm test'),),
+    '.tsx': (('package.json', 'npm test'),),
+    '.jsx': (('package.json', 'npm test'),),
+    '.go': ((None, 'go test ./...'),),
+}
 
-def get_test_reminder(file_path, project_root):
+
+def get_test_reminder(file_path, ext, project_root):
     """Check if tests should be run and return reminder message."""
     if is_test_file(file_path):
         return None  # Editing a test file, no reminder needed
 
-    ext = os.path.splitext(file_path)[1]
-    code_extensions = ('.rs', '.py', '.js', '.ts', '.tsx', '.jsx', '.go')
-
-    if ext not in code_extensions:
+    if ext not in TEST_COMMANDS:
         return None
 
     # Check for marker file
     marker_dir = project_root or os.path.dirname(file_path)
     marker_file = os.path.join(marker_dir, '.chainlink', 'last_test_run')
 
-    code_modified_after_tests = False
-
-    if os.path.exists(marker_file):
-        try:
-            marker_mtime = os.path.getmtime(marker_file)
-            file_mtime = os.path.getmtime(file_path)
-            code_modified_after_tests = file_mtime > marker_mtime
-        except OSError:
-            code_modified_after_tests = True
-    else:
-        # No marker = tests haven't been run
-        code_modified_after_tests = True
-
-    if not code_modified_after_tests:
+    # Skip the reminder only if tests ran after the file changed (no marker = never run)
+    marker_stat = stat_path(marker_file)
+    file_stat = stat_path(file_path)
+    if marker_stat and file_stat and file_stat.st_mtime <= marker_stat.st_mtime:
         return None
 
     # Find test files
-    test_files = find_test_files(file_path, project_root)
+    test_files = find_test_files(file_path, ext, project_root)
 
     # Generate test command based on project type
     test_cmd = None
-    if ext == '.rs' and project_root:
-        if os.path.exists(os.path.join(project_root, 'Cargo.toml')):
-            test_cmd = 'cargo test'
-    elif ext == '.py':
-        if project_root and os.path.exists(os.path.join(project_root, 'pytest.ini')):
-            test_cmd = 'pytest'
-        elif project_root and os.path.exists(os.path.join(project_root, 'setup.py')):
-            test_cmd = 'python -m pytest'
-    elif ext in ('.js', '.ts', '.tsx', '.jsx') and project_root:
-        if os.path.exists(os.path.join(project_root, 'package.json')):
-            test_cmd = 'npm test'
-    elif ext == '.go' and project_root:
-        test_cmd = 'go test ./...'
+    if project_root:
+        for marker, cmd in TEST_COMMANDS[ext]:
+            if marker is None or stat_path(os.path.join(project_root, marker)):
+                test_cmd = cmd
+                break
 
     if test_files or test_cmd:
         msg = "🧪 TEST REMINDER: Code modified since last test run."
@@ -294,10 +773,46 @@ def get_test_reminder(file_path, project_root):
     return None
 
 
+def format_stub_findings(file_path, stub_findings):
+    """Format the first five stub findings as a message."""
+    buf = io.StringIO()
+    buf.write(f"⚠️ STUB PATTERNS DETECTED in {file_path}:\n")
+    for ln, desc, content in stub_findings[:5]:
+        buf.write(f"  Line {ln}: {desc} - `{content}`\n")
+    if len(stub_findings) > 5:
+        more = len(stub_findings) - 5
+        # A capped scan means there may be more than we counted
+        plus = "+" if len(stub_findings) >= STUB_EARLY_STOP else ""
+        buf.write(f"  ... and {more}{plus} more\n")
+    buf.write("\nFix these NOW - replace with real implementation.")
+    return buf.getvalue()
+
+
+def format_linter_errors(header, errors):
+    """Format the first ten linter errors under header."""
+    buf = io.StringIO()
+    buf.write(header)
+    for e in errors[:10]:
+        buf.write(f"\n  {e}")
+    if len(errors) > 10:
+        buf.write("\n  ... and more")
+    return buf.getvalue()
+
+
+CODE_EXTS = frozenset({
+    '.rs', '.py', '.js', '.ts', '.tsx', '.jsx', '.go', '.java',
+    '.c', '.cpp', '.h', '.hpp', '.cs', '.rb', '.php', '.swift',
+    '.kt', '.scala', '.zig', '.odin',
+})
+
+# Edits to the hooks themselves are never checked
+HOOKS_DIR = os.path.join('.claude', 'hooks')
+
+
 def main():
     try:
-        input_data = json.load(sys.stdin)
-    except (json.JSONDecodeError, Exception):
+        input_data = _loads(sys.stdin.buffer.read())
+    except ValueError:  # JSONDecodeError or undecodable bytes
         sys.exit(0)
 
     tool_name = input_data.get("tool_name", "")
@@ -308,75 +823,69 @@ def main():
 
     file_path = tool_input.get("file_path", "")
 
-    code_extensions = (
-        '.rs', '.py', '.js', '.ts', '.tsx', '.jsx', '.go', '.java',
-        '.c', '.cpp', '.h', '.hpp', '.cs', '.rb', '.php', '.swift',
-        '.kt', '.scala', '.zig', '.odin'
-    )
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in CODE_EXTS:
+        sys.exit(0)
 
-    if not any(file_path.endswith(ext) for ext in code_extensions):
+    if HOOKS_DIR in os.path.normpath(file_path):
         sys.exit(0)
 
-    if '.claude' in file_path and 'hooks' in file_path:
+    if is_generated_or_vendored(file_path, vendor_base_dir(file_path)) or looks_minified(file_path):
         sys.exit(0)
 
     # Find project root for linter and test detection
-    project_root = find_project_root(file_path, [
-        'Cargo.toml', 'package.json', 'go.mod', 'setup.py',
-        'pyproject.toml', '.git'
-    ])
+    project_root = find_project_root(file_path, PROJECT_ROOT_MARKERS)
 
     # Check for stubs (always - instant regex check)
     stub_findings = check_for_stubs(file_path)
 
-    # Debounced linting: only run linter if no edits in last 10 seconds
-    # Track last edit time via marker file
-    linter_errors = []
-    lint_marker = None
+    # Debounced, batched linting: edits queue up while the user is actively
+    # editing; the first edit after 10 idle seconds lints the whole queue
+    chainlink_cache = None
     if project_root:
         chainlink_cache = os.path.join(project_root, '.chainlink', '.cache')
-        lint_marker = os.path.join(chainlink_cache, 'last-edit-time')
+        batch = queue_for_lint(chainlink_cache, file_path)
+    else:
+        batch = [file_path]
 
-    should_lint = True
-    if lint_marker:
-        try:
-            os.makedirs(os.path.dirname(lint_marker), exist_ok=True)
-            if os.path.exists(lint_marker):
-                last_edit = os.path.getmtime(lint_marker)
-                elapsed = time.time() - last_edit
-                # If last edit was < 10 seconds ago, skip linting (rapid edits)
-                if elapsed < 10:
-                    should_lint = False
-            # Update the marker to current time
-            with open(lint_marker, 'w') as f:
-                f.write(str(time.time()))
-        except OSError:
-            pass
+    # Report what the previous background run found before starting another
+    background_errors = None
+    if chainlink_cache and ext in BACKGROUND_LINT_EXTS:
+        background_errors = take_background_lint(background_lint_path(chainlink_cache, ext, project_root))
 
-    if should_lint:
-        linter_errors = run_linter(file_path)
+    # Group the batch by linter so each linter runs once over its files
+    groups = {}
+    for path in batch:
+        path_ext = os.path.splitext(path)[1].lower()
+        linter = LINTERS.get(path_ext)
+        if linter and os.path.exists(path):
+            groups.setdefault(linter, (path_ext, []))[1].append(path)
+
+    linter_errors = []
+    for group_ext, paths in groups.values():
+        if chainlink_cache and group_ext in BACKGROUND_LINT_EXTS:
+            result_path = background_lint_path(chainlink_cache, group_ext, project_root)
+            if not start_background_lint(paths, group_ext, project_root, chainlink_cache, result_path):
+                # A worker is still busy with this linter; lint these next time
+                requeue_for_lint(chainlink_cache, paths)
+        else:
+            linter_errors.extend(run_linter(paths, group_ext, project_root, cache_dir=chainlink_cache))
 
     # Check for test reminder
-    test_reminder = get_test_reminder(file_path, project_root)
+    test_reminder = get_test_reminder(file_path, ext, project_root)
 
     # Build output
     messages = []
 
     if stub_findings:
-        stub_list = "\n".join([f"  Line {ln}: {desc} - `{content}`" for ln, desc, content in stub_findings[:5]])
-        if len(stub_findings) > 5:
-            stub_list += f"\n  ... and {len(stub_findings) - 5} more"
-        messages.append(f"""⚠️ STUB PATTERNS DETECTED in {file_path}:
-{stub_list}
-
-Fix these NOW - replace with real implementation.""")
+        messages.append(format_stub_findings(file_path, stub_findings))
 
     if linter_errors:
-        error_list = "\n".join([f"  {e}" for e in linter_errors[:10]])
-        if len(linter_errors) > 10:
-            error_list += f"\n  ... and more"
-        messages.append(f"""🔍 LINTER ISSUES:
-{error_list}""")
+        messages.append(format_linter_errors("🔍 LINTER ISSUES:", linter_errors))
+
+    if background_errors:
+        messages.append(format_linter_errors(
+            "🔍 LINTER ISSUES (background lint after an earlier edit):", background_errors))
 
     if test_reminder:
         messages.append(test_reminder)
@@ -396,9 +905,12 @@ Fix these NOW - replace with real implementation.""")
             }
         }
 
-    print(json.dumps(output))
+    sys.stdout.buffer.write(_dumps(output) + b"\n")
     sys.exit(0)
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) >= 7 and sys.argv[1] == '--lint-worker':
+        lint_worker(*sys.argv[2:])
+    else:
+        main()
@@ -662,6 +662,41 @@ mod tests {
         assert!(!RULE_RUST.is_empty());
     }
 
+    /// The quoted strings in a Python list assignment `name = [...]`
+    fn python_string_list<'a>(script: &'a str, name: &str) -> Vec<&'a str> {
+        let start = script
+            .find(&format!("{} = [", name))
+            .unwrap_or_else(|| panic!("{} not found", name));
+        let list = &script[start..];
+        let list = &list[list.find('[').unwrap() + 1..list.find(']').unwrap()];
+        list.split('"').skip(1).step_by(2).collect()
+    }
+
+    #[test]
+    fn test_work_check_defaults_match_hook_config() {
+        // work-check.py falls back to its own lists when hook-config.json is
+        // missing or leaves a key out; they must match what init installs
+        let config: serde_json::Value = serde_json::from_str(HOOK_CONFIG_JSON).unwrap();
+        for (key, name) in [
+            ("blocked_git_commands", "DEFAULT_BLOCKED_GIT"),
+            ("allowed_bash_prefixes", "DEFAULT_ALLOWED_BASH"),
+        ] {
+            let shipped: Vec<&str> = config[key]
+                .as_array()
+                .unwrap()
+                .iter()
+                .map(|v| v.as_str().unwrap())
+                .collect();
+            assert_eq!(
+                python_string_list(WORK_CHECK_PY, name),
+                shipped,
+                "work-check.py {} differs from hook-config.json {}",
+                name,
+                key
+            );
+        }
+    }
+
     #[test]
     fn test_rule_files_count() {
         // Verify we have the expected number of rule files